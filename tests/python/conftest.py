@@ -3,13 +3,54 @@
 import os
 import tempfile
 
+# Avoid oversubscribing the CPU cores when tests run in multiple pytest-xdist workers. The OpenMP
+# runtime reads OMP_NUM_THREADS when it is loaded, so this must happen before importing treelite.
+if 'PYTEST_XDIST_WORKER' in os.environ:
+    os.environ['OMP_NUM_THREADS'] = '1'
+
+# pylint: disable=wrong-import-position
+import numpy as np
 import pytest
 import treelite
 import treelite_runtime
-from sklearn.datasets import load_svmlight_file
+from sklearn.datasets import load_boston, load_iris, load_svmlight_file
+from sklearn.model_selection import train_test_split
 from .metadata import dataset_db
 
 
+def pytest_addoption(parser):
+    """Add custom command-line options"""
+    parser.addoption('--verbose-compile', action='store_true', default=False,
+                     help='Print messages from the C compiler and the predictor')
+    parser.addoption('--runslow', action='store_true', default=False, help='Run slow tests')
+
+
+def pytest_configure(config):
+    """Register custom markers and apply custom command-line options"""
+    config.addinivalue_line('markers', 'slow: test is slow to run; skipped unless --runslow')
+    if config.getoption('verbose_compile'):
+        # Must be set before the test modules import tests/python/util.py
+        os.environ['TL_VERBOSE_COMPILE'] = '1'
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless requested"""
+    if not config.getoption('runslow'):
+        skip_slow = pytest.mark.skip(reason='Slow test; use --runslow to run')
+        for item in items:
+            if item.get_closest_marker('slow') is not None:
+                item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope='session')
+def worker_nthread():
+    """Number of threads that each pytest-xdist worker may use without oversubscribing the CPU
+    cores. Use this for tests that benefit from parallelism."""
+    # Import lazily, since util.py must not be imported before pytest_configure() runs
+    from .util import PREDICTOR_NTHREAD
+    return PREDICTOR_NTHREAD
+
+
 @pytest.fixture(scope='session')
 def annotation():
     """Pre-computed branch annotation information for example datasets"""
@@ -29,3 +70,112 @@ def annotation():
                 return f.read()
         annotation_db = {k: compute_annotation(k) for k in dataset_db}
     return annotation_db
+
+
+@pytest.fixture(scope='session')
+def compile_cache_dir(tmp_path_factory):
+    """Directory holding compiled shared libraries, keyed by content hash. Set the environment
+    variable TREELITE_TEST_CACHE to keep the cache between test runs."""
+    if 'TREELITE_TEST_CACHE' in os.environ:
+        cache_dir = os.environ['TREELITE_TEST_CACHE']
+        os.makedirs(cache_dir, exist_ok=True)
+        return cache_dir
+    return str(tmp_path_factory.mktemp('tl_cache', numbered=False))
+
+
+def _load_and_split(loader):
+    X, y = loader(return_X_y=True)
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    return train_test_split(X, y, test_size=0.2, shuffle=False)
+
+
+@pytest.fixture(name='boston_xy', scope='session')
+def boston_xy_fixture():
+    """Boston data (regression), split into training and test sets"""
+    return _load_and_split(load_boston)
+
+
+@pytest.fixture(name='iris_xy', scope='session')
+def iris_xy_fixture():
+    """Iris data (multi-class classification), split into training and test sets"""
+    return _load_and_split(load_iris)
+
+
+@pytest.fixture(scope='session')
+def boston_test_dmat(boston_xy):
+    """Test split of Boston data, as Treelite DMatrix"""
+    _, X_test, _, _ = boston_xy
+    return treelite_runtime.DMatrix(X_test)
+
+
+@pytest.fixture(scope='session')
+def iris_test_dmat(iris_xy):
+    """Test split of Iris data, as Treelite DMatrix"""
+    _, X_test, _, _ = iris_xy
+    return treelite_runtime.DMatrix(X_test)
+
+
+@pytest.fixture(name='synthetic_data', scope='session')
+def synthetic_data_fixture():
+    """Function to generate random dummy data. Calling it returns the tuple (X, y, dmat) where dmat
+    is X as Treelite DMatrix. Results are cached, so that the data is generated once per session
+    for each combination of arguments."""
+    cache = {}
+
+    def generate(nrow, ncol, max_label, seed=0):
+        key = (nrow, ncol, max_label, seed)
+        if key not in cache:
+            rng = np.random.default_rng(seed)
+            X = rng.standard_normal((nrow, ncol), dtype=np.float32)
+            y = rng.integers(0, max_label, size=nrow)
+            cache[key] = (X, y, treelite_runtime.DMatrix(X))
+        return cache[key]
+
+    return generate
+
+
+@pytest.fixture(name='boston_booster', scope='session',
+                params=['reg:linear', 'reg:squarederror', 'reg:squaredlogerror',
+                        'reg:pseudohubererror'])
+def boston_booster_fixture(request, boston_xy):
+    """XGBoost regressor trained on Boston data, shared across tests in the session. The fixture
+    is parametrized by the training objective; override it with indirect parametrization to train
+    with a subset of objectives."""
+    xgboost = pytest.importorskip('xgboost')
+    X_train, X_test, y_train, y_test = boston_xy
+    dtrain = xgboost.DMatrix(X_train, label=y_train)
+    dtest = xgboost.DMatrix(X_test, label=y_test)
+    param = {'max_depth': 8, 'eta': 1, 'silent': 1, 'objective': request.param, 'nthread': 1}
+    num_round = 10
+    bst = xgboost.train(param, dtrain, num_boost_round=num_round,
+                        evals=[(dtrain, 'train'), (dtest, 'test')])
+    return bst, X_train, X_test, y_train, y_test, dtrain, dtest, num_round
+
+
+@pytest.fixture(scope='session')
+def boston_expected_pred(boston_booster):
+    """Predictions of boston_booster for the test split of Boston data"""
+    bst, _, _, _, _, _, dtest, _ = boston_booster
+    return bst.predict(dtest)
+
+
+@pytest.fixture(scope='session', params=[5, pytest.param(50, marks=pytest.mark.slow)])
+def dart_booster(request, synthetic_data):
+    """XGBoost DART booster trained on dummy data, shared across tests in the session. The fixture
+    is parametrized by the number of boosting rounds; the variant with many rounds is marked slow.
+    one_drop=1 ensures that trees are dropped even with few boosting rounds."""
+    xgboost = pytest.importorskip('xgboost')
+    X, y, dmat = synthetic_data(16, 8, 2)
+    dtrain = xgboost.DMatrix(X, label=y)
+    param = {'booster': 'dart',
+             'max_depth': 5, 'learning_rate': 0.1,
+             'objective': 'binary:logistic',
+             'sample_type': 'uniform',
+             'normalize_type': 'tree',
+             'rate_drop': 0.1,
+             'skip_drop': 0.5,
+             'one_drop': 1,
+             'nthread': 1}
+    num_round = request.param
+    bst = xgboost.train(param, dtrain=dtrain, num_boost_round=num_round)
+    return bst, X, y, dtrain, dmat, num_round
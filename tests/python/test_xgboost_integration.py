@@ -1,159 +1,128 @@
 # -*- coding: utf-8 -*-
 """Tests for XGBoost integration"""
 # pylint: disable=R0201, R0915
+import importlib.util
+import json
 import math
 import os
 
 import numpy as np
 import pytest
 import treelite
-import treelite_runtime
-from treelite.contrib import _libext
-from sklearn.datasets import load_boston, load_iris
-from sklearn.model_selection import train_test_split
-from .util import os_compatible_toolchains, check_predictor
+from .util import os_compatible_toolchains, check_predictor, check_model_and_predictor, \
+    check_pred_close, compile_lib_cached, load_predictor_cached, VERBOSE_COMPILE
 from .metadata import dataset_db
 
-try:
-    import xgboost
-except ImportError:
-    # skip this test suite if XGBoost is not installed
+# skip this test suite if XGBoost is not installed. XGBoost itself is imported lazily inside the
+# tests, so that collecting this module stays cheap.
+if importlib.util.find_spec('xgboost') is None:
     pytest.skip('XGBoost not installed; skipping', allow_module_level=True)
 
 
-@pytest.mark.parametrize('model_format', ['binary', 'json'])
-@pytest.mark.parametrize('objective', ['reg:linear', 'reg:squarederror', 'reg:squaredlogerror',
-                                       'reg:pseudohubererror'])
+def load_xgb_models(tmpdir, bst, name):
+    """Save XGBoost model in the binary and JSON formats, and load both into Treelite"""
+    model_bin_path = os.path.join(tmpdir, f'{name}.bin')
+    bst.save_model(model_bin_path)
+    model_json_path = os.path.join(tmpdir, f'{name}.json')
+    bst.save_model(model_json_path)
+    model_bin = treelite.Model.load(model_bin_path, model_format='xgboost')
+    model_json = treelite.Model.load(model_json_path, model_format='xgboost_json')
+    return model_bin, model_json
+
+
 @pytest.mark.parametrize('toolchain', os_compatible_toolchains())
-def test_xgb_boston(tmpdir, toolchain, objective, model_format):
-    # pylint: disable=too-many-locals
+def test_xgb_boston(toolchain, boston_booster, boston_expected_pred, boston_test_dmat,
+                    compile_cache_dir):
     """Test Boston data (regression)"""
-    X, y = load_boston(return_X_y=True)
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=False)
-    dtrain = xgboost.DMatrix(X_train, label=y_train)
-    dtest = xgboost.DMatrix(X_test, label=y_test)
-    param = {'max_depth': 8, 'eta': 1, 'silent': 1, 'objective': objective}
-    num_round = 10
-    bst = xgboost.train(param, dtrain, num_boost_round=num_round,
-                        evals=[(dtrain, 'train'), (dtest, 'test')])
-    if model_format == 'json':
-        model_name = 'boston.json'
-        model_path = os.path.join(tmpdir, model_name)
-        bst.save_model(model_path)
-        model = treelite.Model.load(filename=model_path, model_format='xgboost_json')
-    else:
-        model = treelite.Model.from_xgboost(bst)
-
-    assert model.num_feature == dtrain.num_col()
-    assert model.num_class == 1
-    assert model.num_tree == num_round
-    libpath = os.path.join(tmpdir, 'boston' + _libext())
-    model.export_lib(toolchain=toolchain, libpath=libpath, params={'parallel_comp': model.num_tree},
-                     verbose=True)
-
-    predictor = treelite_runtime.Predictor(libpath=libpath, verbose=True)
-    assert predictor.num_feature == dtrain.num_col()
-    assert predictor.num_class == 1
-    assert predictor.pred_transform == 'identity'
-    assert predictor.global_bias == 0.5
-    assert predictor.sigmoid_alpha == 1.0
-    dmat = treelite_runtime.DMatrix(X_test, dtype='float32')
-    out_pred = predictor.predict(dmat)
-    expected_pred = bst.predict(dtest)
-    np.testing.assert_almost_equal(out_pred, expected_pred, decimal=5)
+    bst, _, _, _, _, dtrain, _, num_round = boston_booster
+    model = treelite.Model.from_xgboost(bst)
+    cached_libpath = compile_lib_cached(model, toolchain, {}, compile_cache_dir,
+                                        verbose=VERBOSE_COMPILE)
+
+    predictor = load_predictor_cached(cached_libpath)
+    check_model_and_predictor(model, predictor, {
+        'num_feature': dtrain.num_col(), 'num_class': 1, 'num_tree': num_round,
+        'pred_transform': 'identity', 'global_bias': 0.5, 'sigmoid_alpha': 1.0})
+    out_pred = predictor.predict(boston_test_dmat)
+    check_pred_close(out_pred, boston_expected_pred)
 
 
-@pytest.mark.parametrize('model_format', ['binary', 'json'])
 @pytest.mark.parametrize('objective,expected_pred_transform',
                          [('multi:softmax', 'max_index'), ('multi:softprob', 'softmax')],
                          ids=['multi:softmax', 'multi:softprob'])
 @pytest.mark.parametrize('toolchain', os_compatible_toolchains())
-def test_xgb_iris(tmpdir, toolchain, objective, model_format, expected_pred_transform):
-    # pylint: disable=too-many-locals
+def test_xgb_iris(toolchain, objective, expected_pred_transform, iris_xy, iris_test_dmat,
+                  compile_cache_dir):
+    # pylint: disable=too-many-locals,too-many-arguments
     """Test Iris data (multi-class classification)"""
-    X, y = load_iris(return_X_y=True)
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=False)
+    import xgboost
+    X_train, X_test, y_train, y_test = iris_xy
     dtrain = xgboost.DMatrix(X_train, label=y_train)
     dtest = xgboost.DMatrix(X_test, label=y_test)
     num_class = 3
     num_round = 10
     param = {'max_depth': 6, 'eta': 0.05, 'num_class': num_class, 'verbosity': 0,
-             'objective': objective, 'metric': 'mlogloss'}
+             'objective': objective, 'metric': 'mlogloss', 'nthread': 1}
     bst = xgboost.train(param, dtrain, num_boost_round=num_round,
                         evals=[(dtrain, 'train'), (dtest, 'test')])
 
-    if model_format == 'json':
-        model_name = 'iris.json'
-        model_path = os.path.join(tmpdir, model_name)
-        bst.save_model(model_path)
-        model = treelite.Model.load(filename=model_path, model_format='xgboost_json')
-    else:
-        model = treelite.Model.from_xgboost(bst)
-    assert model.num_feature == dtrain.num_col()
-    assert model.num_class == num_class
-    assert model.num_tree == num_round * num_class
-    libpath = os.path.join(tmpdir, 'iris' + _libext())
-    model.export_lib(toolchain=toolchain, libpath=libpath, params={}, verbose=True)
-
-    predictor = treelite_runtime.Predictor(libpath=libpath, verbose=True)
-    assert predictor.num_feature == dtrain.num_col()
-    assert predictor.num_class == num_class
-    assert predictor.pred_transform == expected_pred_transform
-    assert predictor.global_bias == 0.5
-    assert predictor.sigmoid_alpha == 1.0
-    dmat = treelite_runtime.DMatrix(X_test, dtype='float32')
-    out_pred = predictor.predict(dmat)
+    model = treelite.Model.from_xgboost(bst)
+    cached_libpath = compile_lib_cached(model, toolchain, {}, compile_cache_dir,
+                                        verbose=VERBOSE_COMPILE)
+
+    predictor = load_predictor_cached(cached_libpath)
+    check_model_and_predictor(model, predictor, {
+        'num_feature': dtrain.num_col(), 'num_class': num_class,
+        'num_tree': num_round * num_class, 'pred_transform': expected_pred_transform,
+        'global_bias': 0.5, 'sigmoid_alpha': 1.0})
+    out_pred = predictor.predict(iris_test_dmat)
     expected_pred = bst.predict(dtest)
-    np.testing.assert_almost_equal(out_pred, expected_pred, decimal=5)
-
-
-@pytest.mark.parametrize('model_format', ['binary', 'json'])
-@pytest.mark.parametrize('objective,max_label,expected_global_bias',
-                         [('binary:logistic', 2, 0),
-                          ('binary:hinge', 2, 0.5),
-                          ('binary:logitraw', 2, 0.5),
-                          ('count:poisson', 4, math.log(0.5)),
-                          ('rank:pairwise', 5, 0.5),
-                          ('rank:ndcg', 5, 0.5),
-                          ('rank:map', 5, 0.5)],
-                         ids=['binary:logistic', 'binary:hinge', 'binary:logitraw',
-                              'count:poisson', 'rank:pairwise', 'rank:ndcg', 'rank:map'])
-@pytest.mark.parametrize('toolchain', os_compatible_toolchains())
-def test_nonlinear_objective(tmpdir, objective, max_label, expected_global_bias, toolchain,
-                             model_format):
-    # pylint: disable=too-many-locals,too-many-arguments
-    """Test non-linear objectives with dummy data"""
-    np.random.seed(0)
+    check_pred_close(out_pred, expected_pred)
+
+
+@pytest.fixture(name='trained_nonlinear_bst', scope='module')
+def trained_nonlinear_bst_fixture(request, synthetic_data):
+    """XGBoost model trained on dummy data with a non-linear objective. Parametrize indirectly with
+    (objective, max_label), so that each objective is trained once and shared across toolchains.
+    Returns the objective along with the model."""
+    import xgboost
+    objective, max_label = request.param
     nrow = 16
     ncol = 8
-    X = np.random.randn(nrow, ncol)
-    y = np.random.randint(0, max_label, size=nrow)
+    X, y, dmat = synthetic_data(nrow, ncol, max_label)
     assert np.min(y) == 0
     assert np.max(y) == max_label - 1
 
-    num_round = 4
     dtrain = xgboost.DMatrix(X, label=y)
     if objective.startswith('rank:'):
         dtrain.set_group([nrow])
-    bst = xgboost.train({'objective': objective, 'base_score': 0.5, 'seed': 0},
-                        dtrain=dtrain, num_boost_round=num_round)
+    bst = xgboost.train({'objective': objective, 'base_score': 0.5, 'seed': 0, 'nthread': 1},
+                        dtrain=dtrain, num_boost_round=4)
+    return objective, bst, dtrain, dmat
+
+
+@pytest.mark.parametrize('trained_nonlinear_bst,expected_global_bias',
+                         [(('binary:logistic', 2), 0),
+                          (('binary:hinge', 2), 0.5),
+                          (('binary:logitraw', 2), 0.5),
+                          (('count:poisson', 4), math.log(0.5)),
+                          (('rank:pairwise', 5), 0.5),
+                          (('rank:ndcg', 5), 0.5),
+                          (('rank:map', 5), 0.5)],
+                         ids=['binary:logistic', 'binary:hinge', 'binary:logitraw',
+                              'count:poisson', 'rank:pairwise', 'rank:ndcg', 'rank:map'],
+                         indirect=['trained_nonlinear_bst'])
+@pytest.mark.parametrize('toolchain', os_compatible_toolchains())
+def test_nonlinear_objective(trained_nonlinear_bst, expected_global_bias, toolchain,
+                             compile_cache_dir):
+    # pylint: disable=too-many-locals,too-many-arguments
+    """Test non-linear objectives with dummy data"""
+    objective, bst, dtrain, dmat = trained_nonlinear_bst
+    num_round = 4
 
-    objective_tag = objective.replace(':', '_')
-    if model_format == 'json':
-        model_name = f'nonlinear_{objective_tag}.json'
-    else:
-        model_name = f'nonlinear_{objective_tag}.bin'
-    model_path = os.path.join(tmpdir, model_name)
-    bst.save_model(model_path)
-
-    model = treelite.Model.load(
-        filename=model_path,
-        model_format=('xgboost_json' if model_format == 'json' else 'xgboost'))
-    assert model.num_feature == dtrain.num_col()
-    assert model.num_class == 1
-    assert model.num_tree == num_round
-    libpath = os.path.join(tmpdir, objective_tag + _libext())
-    model.export_lib(toolchain=toolchain, libpath=libpath, params={}, verbose=True)
+    model = treelite.Model.from_xgboost(bst)
+    cached_libpath = compile_lib_cached(model, toolchain, {}, compile_cache_dir,
+                                        verbose=VERBOSE_COMPILE)
 
     expected_pred_transform = {'binary:logistic': 'sigmoid',
                                'binary:hinge': 'hinge',
@@ -163,169 +132,137 @@ def test_nonlinear_objective(tmpdir, objective, max_label, expected_global_bias,
                                'rank:ndcg': 'identity',
                                'rank:map': 'identity'}
 
-    predictor = treelite_runtime.Predictor(libpath=libpath, verbose=True)
-    assert predictor.num_feature == dtrain.num_col()
-    assert predictor.num_class == 1
-    assert predictor.pred_transform == expected_pred_transform[objective]
-    np.testing.assert_almost_equal(predictor.global_bias, expected_global_bias, decimal=5)
-    assert predictor.sigmoid_alpha == 1.0
-    dmat = treelite_runtime.DMatrix(X, dtype='float32')
+    predictor = load_predictor_cached(cached_libpath)
+    check_model_and_predictor(model, predictor, {
+        'num_feature': dtrain.num_col(), 'num_class': 1, 'num_tree': num_round,
+        'pred_transform': expected_pred_transform[objective],
+        'global_bias': expected_global_bias, 'sigmoid_alpha': 1.0})
     out_pred = predictor.predict(dmat)
     expected_pred = bst.predict(dtrain)
-    np.testing.assert_almost_equal(out_pred, expected_pred, decimal=5)
-
-
+    check_pred_close(out_pred, expected_pred)
+
+
+@pytest.mark.parametrize('boston_booster', ['reg:linear'], indirect=True)
+def test_parallel_comp_compile(boston_booster, boston_expected_pred, boston_test_dmat,
+                               compile_cache_dir, worker_nthread):
+    """Test code generation with multiple translation units (parallel_comp)"""
+    bst = boston_booster[0]
+    toolchain = os_compatible_toolchains()[0]
+    model = treelite.Model.from_xgboost(bst)
+    cached_libpath = compile_lib_cached(model, toolchain, {'parallel_comp': model.num_tree},
+                                        compile_cache_dir,
+                                        verbose=VERBOSE_COMPILE, nthread=worker_nthread)
+
+    predictor = load_predictor_cached(cached_libpath)
+    out_pred = predictor.predict(boston_test_dmat)
+    check_pred_close(out_pred, boston_expected_pred)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('boston_booster', ['reg:linear'], indirect=True)
+def test_optimized_compile(boston_booster, boston_expected_pred, boston_test_dmat,
+                           compile_cache_dir):
+    """Test prediction code compiled with full optimization. Other tests compile without
+    optimization, for speed."""
+    bst = boston_booster[0]
+    toolchain = os_compatible_toolchains()[0]
+    model = treelite.Model.from_xgboost(bst)
+    cached_libpath = compile_lib_cached(model, toolchain, {}, compile_cache_dir,
+                                        verbose=VERBOSE_COMPILE, optimize=True)
+
+    predictor = load_predictor_cached(cached_libpath)
+    out_pred = predictor.predict(boston_test_dmat)
+    check_pred_close(out_pred, boston_expected_pred)
+
+
+@pytest.mark.parametrize('source', ['binary', 'json_file', 'json_raw'])
+@pytest.mark.parametrize('boston_booster', ['reg:linear'], indirect=True)
 @pytest.mark.parametrize('toolchain', os_compatible_toolchains())
-def test_xgb_deserializers(tmpdir, toolchain):
-    # pylint: disable=too-many-locals
+def test_xgb_deserializers(tmpdir, toolchain, source, boston_booster, boston_expected_pred,
+                           boston_test_dmat, compile_cache_dir):
+    # pylint: disable=too-many-arguments
     """Test Boston data (regression)"""
-    # Train xgboost model
-    X, y = load_boston(return_X_y=True)
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, shuffle=False
-    )
-    dtrain = xgboost.DMatrix(X_train, label=y_train)
-    dtest = xgboost.DMatrix(X_test, label=y_test)
-    param = {'max_depth': 8, 'eta': 1, 'silent': 1, 'objective': 'reg:linear'}
-    num_round = 10
-    bst = xgboost.train(param, dtrain, num_boost_round=num_round,
-                        evals=[(dtrain, 'train'), (dtest, 'test')])
+    bst, _, _, _, _, dtrain, _, num_round = boston_booster
 
-    # Serialize xgboost model
-    model_bin_path = os.path.join(tmpdir, 'serialized.model')
-    bst.save_model(model_bin_path)
-    model_json_path = os.path.join(tmpdir, 'serialized.json')
-    bst.save_model(model_json_path)
-    model_json_str = bst.save_raw(raw_format="json")
-
-    # Construct Treelite models from xgboost serializations
-    model_bin = treelite.Model.load(
-        model_bin_path, model_format='xgboost'
-    )
-    model_json = treelite.Model.load(
-        model_json_path, model_format='xgboost_json'
-    )
-    model_json_str = treelite.Model.from_xgboost_json(model_json_str)
-
-    # Compile models to libraries
-    model_bin_lib = os.path.join(tmpdir, 'bin{}'.format(_libext()))
-    model_bin.export_lib(
-        toolchain=toolchain,
-        libpath=model_bin_lib,
-        params={'parallel_comp': model_bin.num_tree}
-    )
-    model_json_lib = os.path.join(tmpdir, 'json{}'.format(_libext()))
-    model_json.export_lib(
-        toolchain=toolchain,
-        libpath=model_json_lib,
-        params={'parallel_comp': model_json.num_tree}
-    )
-    model_json_str_lib = os.path.join(tmpdir, 'json_str{}'.format(_libext()))
-    model_json_str.export_lib(
-        toolchain=toolchain,
-        libpath=model_json_str_lib,
-        params={'parallel_comp': model_json_str.num_tree}
-    )
-
-    # Generate predictors from compiled libraries
-    predictor_bin = treelite_runtime.Predictor(model_bin_lib)
-    assert predictor_bin.num_feature == dtrain.num_col()
-    assert predictor_bin.num_class == 1
-    assert predictor_bin.pred_transform == 'identity'
-    assert predictor_bin.global_bias == pytest.approx(0.5)
-    assert predictor_bin.sigmoid_alpha == pytest.approx(1.0)
-
-    predictor_json = treelite_runtime.Predictor(model_json_lib)
-    assert predictor_json.num_feature == dtrain.num_col()
-    assert predictor_json.num_class == 1
-    assert predictor_json.pred_transform == 'identity'
-    assert predictor_json.global_bias == pytest.approx(0.5)
-    assert predictor_json.sigmoid_alpha == pytest.approx(1.0)
-
-    predictor_json_str = treelite_runtime.Predictor(model_json_str_lib)
-    assert predictor_json_str.num_feature == dtrain.num_col()
-    assert predictor_json_str.num_class == 1
-    assert predictor_json_str.pred_transform == 'identity'
-    assert predictor_json_str.global_bias == pytest.approx(0.5)
-    assert predictor_json_str.sigmoid_alpha == pytest.approx(1.0)
-
-    # Run inference with each predictor
-    dmat = treelite_runtime.DMatrix(X_test, dtype='float32')
-    bin_pred = predictor_bin.predict(dmat)
-    json_pred = predictor_json.predict(dmat)
-    json_str_pred = predictor_json_str.predict(dmat)
+    # Serialize xgboost model and construct Treelite model from the serialization
+    if source == 'binary':
+        model_path = os.path.join(tmpdir, 'serialized.model')
+        bst.save_model(model_path)
+        model = treelite.Model.load(model_path, model_format='xgboost')
+    elif source == 'json_file':
+        model_path = os.path.join(tmpdir, 'serialized.json')
+        bst.save_model(model_path)
+        model = treelite.Model.load(model_path, model_format='xgboost_json')
+    else:
+        model = treelite.Model.from_xgboost_json(bst.save_raw(raw_format='json'))
 
-    expected_pred = bst.predict(dtest)
-    np.testing.assert_almost_equal(bin_pred, expected_pred, decimal=5)
-    np.testing.assert_almost_equal(json_pred, expected_pred, decimal=5)
-    np.testing.assert_almost_equal(json_str_pred, expected_pred, decimal=5)
+    # Compile model to library
+    cached_libpath = compile_lib_cached(model, toolchain, {}, compile_cache_dir,
+                                        verbose=VERBOSE_COMPILE)
+
+    # Generate predictor from compiled library
+    predictor = load_predictor_cached(cached_libpath)
+    check_model_and_predictor(model, predictor, {
+        'num_feature': dtrain.num_col(), 'num_class': 1, 'num_tree': num_round,
+        'pred_transform': 'identity', 'global_bias': 0.5, 'sigmoid_alpha': 1.0})
+
+    # Run inference with predictor
+    out_pred = predictor.predict(boston_test_dmat)
+    check_pred_close(out_pred, boston_expected_pred)
 
 
 @pytest.mark.parametrize('parallel_comp', [None, 5])
 @pytest.mark.parametrize('quantize', [True, False])
 @pytest.mark.parametrize('toolchain', os_compatible_toolchains())
-def test_xgb_categorical_split(tmpdir, toolchain, quantize, parallel_comp):
+def test_xgb_categorical_split(toolchain, quantize, parallel_comp, compile_cache_dir,
+                               worker_nthread):
+    # pylint: disable=too-many-arguments
     """Test toy XGBoost model with categorical splits"""
     dataset = 'xgb_toy_categorical'
     model = treelite.Model.load(dataset_db[dataset].model, model_format='xgboost_json')
-    libpath = os.path.join(tmpdir, dataset_db[dataset].libname + _libext())
 
     params = {
         'quantize': (1 if quantize else 0),
         'parallel_comp': (parallel_comp if parallel_comp else 0)
     }
-    model.export_lib(toolchain=toolchain, libpath=libpath, params=params, verbose=True)
+    cached_libpath = compile_lib_cached(model, toolchain, params, compile_cache_dir,
+                                        verbose=VERBOSE_COMPILE, nthread=worker_nthread)
 
-    predictor = treelite_runtime.Predictor(libpath)
+    predictor = load_predictor_cached(cached_libpath)
     check_predictor(predictor, dataset)
 
 
-@pytest.mark.parametrize('model_format', ['binary', 'json'])
-@pytest.mark.parametrize('toolchain', os_compatible_toolchains())
-def test_xgb_dart(tmpdir, toolchain, model_format):
-    # pylint: disable=too-many-locals,too-many-arguments
-    """Test dart booster with dummy data"""
-    np.random.seed(0)
-    nrow = 16
-    ncol = 8
-    X = np.random.randn(nrow, ncol)
-    y = np.random.randint(0, 2, size=nrow)
+def test_xgb_dart_train_and_serialize(tmpdir, dart_booster):
+    """Test loading dart booster with dummy data, in both binary and JSON formats"""
+    bst, X, y, dtrain, _, num_round = dart_booster
     assert np.min(y) == 0
     assert np.max(y) == 1
-
-    num_round = 50
-    dtrain = xgboost.DMatrix(X, label=y)
-    param = {'booster': 'dart',
-             'max_depth': 5, 'learning_rate': 0.1,
-             'objective': 'binary:logistic',
-             'sample_type': 'uniform',
-             'normalize_type': 'tree',
-             'rate_drop': 0.1,
-             'skip_drop': 0.5}
-    bst = xgboost.train(param, dtrain=dtrain, num_boost_round=num_round)
-
-    if model_format == 'json':
-        model_json_path = os.path.join(tmpdir, 'serialized.json')
-        bst.save_model(model_json_path)
-        model = treelite.Model.load(model_json_path, model_format='xgboost_json')
-    else:
-        model_bin_path = os.path.join(tmpdir, 'serialized.model')
-        bst.save_model(model_bin_path)
-        model = treelite.Model.load(model_bin_path, model_format='xgboost')
-
-    assert model.num_feature == dtrain.num_col()
-    assert model.num_class == 1
-    assert model.num_tree == num_round
-    libpath = os.path.join(tmpdir, "dart" + _libext())
-    model.export_lib(toolchain=toolchain, libpath=libpath, params={}, verbose=True)
-
-    predictor = treelite_runtime.Predictor(libpath=libpath, verbose=True)
-    assert predictor.num_feature == dtrain.num_col()
-    assert predictor.num_class == 1
-    assert predictor.pred_transform == 'sigmoid'
-    np.testing.assert_almost_equal(predictor.global_bias, 0, decimal=5)
-    assert predictor.sigmoid_alpha == 1.0
-    dmat = treelite_runtime.DMatrix(X, dtype='float32')
+    # Ensure that dropout was triggered, so that the weight_drop scaling is exercised
+    weight_drop = json.loads(bst.save_raw(raw_format='json'))['learner']['gradient_booster'][
+        'weight_drop']
+    assert min(weight_drop) < 1.0, weight_drop
+
+    model_bin, model_json = load_xgb_models(tmpdir, bst, 'dart')
+    for model in [model_bin, model_json]:
+        check_model_and_predictor(model, None, {
+            'num_feature': dtrain.num_col(), 'num_class': 1, 'num_tree': num_round})
+    expected_pred = bst.predict(dtrain)
+    gtil_pred = treelite.gtil.predict(model_json, X)
+    check_pred_close(gtil_pred, expected_pred)
+
+
+def test_xgb_dart_compile(dart_booster, compile_cache_dir):
+    """Test compiling dart booster with dummy data"""
+    bst, _, _, dtrain, dmat, num_round = dart_booster
+    toolchain = os_compatible_toolchains()[0]
+    model = treelite.Model.from_xgboost(bst)
+    cached_libpath = compile_lib_cached(model, toolchain, {}, compile_cache_dir,
+                                        verbose=VERBOSE_COMPILE)
+
+    predictor = load_predictor_cached(cached_libpath)
+    check_model_and_predictor(model, predictor, {
+        'num_feature': dtrain.num_col(), 'num_class': 1, 'num_tree': num_round,
+        'pred_transform': 'sigmoid', 'global_bias': 0, 'sigmoid_alpha': 1.0})
     out_pred = predictor.predict(dmat)
     expected_pred = bst.predict(dtrain)
-    np.testing.assert_almost_equal(out_pred, expected_pred, decimal=5)
+    check_pred_close(out_pred, expected_pred)
@@ -1,15 +1,28 @@
 # -*- coding: utf-8 -*-
 """Utility functions for tests"""
+import functools
+import hashlib
 import os
+import tempfile
 from sys import platform as _platform
 from contextlib import contextmanager
 
 import numpy as np
+import treelite
 import treelite_runtime
 from sklearn.datasets import load_svmlight_file
 from treelite.contrib import _libext
 from .metadata import dataset_db
 
+# Whether to print messages from the C compiler and the predictor. Set the environment variable
+# TL_VERBOSE_COMPILE=1 or pass --verbose-compile to pytest to enable.
+VERBOSE_COMPILE = os.environ.get('TL_VERBOSE_COMPILE', '0') == '1'
+
+# Number of threads that each pytest-xdist worker may use without oversubscribing the CPU cores.
+# Used by the cached predictors and by the worker_nthread fixture.
+PREDICTOR_NTHREAD = max(
+    1, (os.cpu_count() or 1) // int(os.environ.get('PYTEST_XDIST_WORKER_COUNT', '1')))
+
 
 def load_txt(filename):
     """Get 1D array from text file"""
@@ -22,18 +35,69 @@ def load_txt(filename):
     return np.array(content, dtype=np.float32)
 
 
+@functools.lru_cache(maxsize=1)
 def os_compatible_toolchains():
-    """Get the list of C compilers to test with the current OS"""
+    """Get the list of C compilers to test with the current OS. The result is computed once and
+    returned as a tuple, so that callers cannot modify the cached value."""
     if _platform == 'darwin':
         gcc = os.environ.get('GCC_PATH', 'gcc')
-        toolchains = [gcc]
+        toolchains = (gcc,)
     elif _platform == 'win32':
-        toolchains = ['msvc']
+        toolchains = ('msvc',)
     else:
-        toolchains = ['gcc', 'clang']
+        toolchains = ('gcc', 'clang')
     return toolchains
 
 
+def compile_lib_cached(model, toolchain, params, cache_dir, verbose=False, nthread=None,
+                       optimize=False):
+    # pylint: disable=too-many-arguments
+    """Compile a model into a shared library in cache_dir, re-using a previously compiled library
+    if the same model was already compiled with the same toolchain and params. Returns the path of
+    the library, which can be passed to load_predictor_cached().
+
+    Unless optimize=True, the library is built without optimization (-O0, or /Od for MSVC).
+    Functional tests only check the predictions, and unoptimized builds compile much faster.
+
+    The C sources are always generated, and the cache key covers the generated sources, the
+    toolchain, the compiler params and the optimization setting. Hence changes to either the model
+    or the code generator invalidate the cached library.
+    """
+    if optimize:
+        options = []
+    else:
+        options = ['/Od'] if toolchain == 'msvc' else ['-O0']
+    with tempfile.TemporaryDirectory(dir=cache_dir) as temp_dir:
+        model.compile(temp_dir, params=params, verbose=verbose)
+        key = hashlib.sha1(toolchain.encode() + repr(sorted(params.items())).encode()
+                           + repr(options).encode())
+        for filename in sorted(os.listdir(temp_dir)):
+            key.update(filename.encode())
+            with open(os.path.join(temp_dir, filename), 'rb') as f:
+                key.update(f.read())
+        cached_libpath = os.path.join(cache_dir, key.hexdigest() + _libext())
+        if not os.path.exists(cached_libpath):
+            temp_libpath = treelite.create_shared(toolchain, temp_dir, nthread=nthread,
+                                                  verbose=verbose, options=options,
+                                                  long_build_time_warning=False)
+            # Build inside cache_dir then rename, so that concurrent test processes never load a
+            # partially written file
+            os.replace(temp_libpath, cached_libpath)
+    return cached_libpath
+
+
+@functools.lru_cache(maxsize=64)
+def _load_predictor(libpath, mtime):  # pylint: disable=unused-argument
+    return treelite_runtime.Predictor(libpath=libpath, nthread=PREDICTOR_NTHREAD,
+                                      verbose=VERBOSE_COMPILE)
+
+
+def load_predictor_cached(libpath):
+    """Load a predictor from a compiled library, re-using the predictor that was previously loaded
+    from the same library. Predictors hold no per-test state, so they are safe to share."""
+    return _load_predictor(libpath, os.path.getmtime(libpath))
+
+
 def os_platform():
     """Detect OS that's running this program"""
     if _platform == 'darwin':
@@ -63,6 +127,31 @@ def does_not_raise():
     yield
 
 
+def check_model_and_predictor(model, predictor, expected):
+    """Check metadata of a Treelite model and of the predictor compiled from it. Either may be None
+    to skip its checks. The dict expected holds num_feature and num_class, plus num_tree for the
+    model and pred_transform, global_bias and sigmoid_alpha for the predictor."""
+    if model is not None:
+        actual = {'num_feature': model.num_feature, 'num_class': model.num_class,
+                  'num_tree': model.num_tree}
+        for key, value in actual.items():
+            assert value == expected[key], f'model.{key} = {value}, expected {expected[key]}'
+    if predictor is not None:
+        actual = {'num_feature': predictor.num_feature, 'num_class': predictor.num_class,
+                  'pred_transform': predictor.pred_transform}
+        for key, value in actual.items():
+            assert value == expected[key], f'predictor.{key} = {value}, expected {expected[key]}'
+        actual = {'global_bias': predictor.global_bias, 'sigmoid_alpha': predictor.sigmoid_alpha}
+        for key, value in actual.items():
+            np.testing.assert_almost_equal(value, expected[key], decimal=5,
+                                           err_msg=f'predictor.{key}')
+
+
+def check_pred_close(out_pred, expected_pred):
+    """Check that predictions match the expected values elementwise, with the same shape"""
+    np.testing.assert_allclose(out_pred, expected_pred, rtol=0, atol=1.5e-5)
+
+
 def check_predictor(predictor, dataset):
     """Check whether a predictor produces correct predictions for a given dataset"""
     dmat = treelite_runtime.DMatrix(
@@ -9,7 +9,7 @@ then
   conda activate python3
   conda --version
   python --version
-  conda install -c conda-forge numpy scipy pandas pytest pytest-cov scikit-learn coverage ninja lcov cmake llvm-openmp
+  conda install -c conda-forge numpy scipy pandas pytest pytest-cov pytest-xdist scikit-learn coverage ninja lcov cmake llvm-openmp
 
   # Run coverage test
   set -x
@@ -24,7 +24,7 @@ then
   python -m pip install lightgbm --no-binary :all:
   python -m pip install codecov
   ./build/treelite_cpp_test
-  PYTHONPATH=./python:./runtime/python python -m pytest --cov=treelite --cov=treelite_runtime -v --fulltrace tests/python
+  PYTHONPATH=./python:./runtime/python python -m pytest -n auto --runslow --cov=treelite --cov=treelite_runtime -v --fulltrace tests/python
   lcov --directory . --capture --output-file coverage.info
   lcov --remove coverage.info '*dmlccore*' --output-file coverage.info
   lcov --remove coverage.info '*fmtlib*' --output-file coverage.info
@@ -64,7 +64,7 @@ then
   conda activate python3
   conda --version
   python --version
-  conda install -c conda-forge numpy scipy pandas pytest scikit-learn coverage ninja cmake llvm-openmp
+  conda install -c conda-forge numpy scipy pandas pytest pytest-xdist scikit-learn coverage ninja cmake llvm-openmp
 
   # Build binary wheel
   set -x
@@ -96,13 +96,13 @@ then
   # Install XGBoost and LightGBM without OpenMP
   python -m pip install https://s3-us-west-2.amazonaws.com/xgboost-nightly-builds/master/xgboost-1.6.0.dev0%2B12949c6b3134817f2f38ca765f42d9fdbda6e600-py3-none-macosx_10_15_x86_64.macosx_11_0_x86_64.macosx_12_0_x86_64.whl
   python -m pip install lightgbm --no-binary :all:
-  python -m pytest -v --fulltrace tests/python
+  python -m pytest -n auto -v --fulltrace tests/python
 fi
 
 if [ ${TASK} == "python_sdist_test" ]; then
   conda activate python3
   python --version
-  conda install -c conda-forge numpy scipy pandas pytest scikit-learn coverage cmake ninja
+  conda install -c conda-forge numpy scipy pandas pytest pytest-xdist scikit-learn coverage cmake ninja
 
   # Build source distribution
   make pippack
@@ -114,7 +114,7 @@ if [ ${TASK} == "python_sdist_test" ]; then
   # Run tests
   python -m pip install https://s3-us-west-2.amazonaws.com/xgboost-nightly-builds/master/xgboost-1.6.0.dev0%2B12949c6b3134817f2f38ca765f42d9fdbda6e600-py3-none-manylinux2014_x86_64.whl
   python -m pip install lightgbm
-  python -m pytest -v --fulltrace tests/python
+  python -m pytest -n auto -v --fulltrace tests/python
 
   # Deploy source wheel to S3
   python -m pip install awscli